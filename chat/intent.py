@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from graph.query import QueryEngine
 
 
@@ -6,16 +8,13 @@ class IntentParser:
         self.query_engine = query_engine
         self.last_result = None
         self.last_entity = None
-
-    def execute_intent(self, intent_data: dict) -> dict:
-        intent = intent_data.get("intent", "UNKNOWN")
-        params = intent_data.get("params", {})
-        clarification = intent_data.get("clarification")
-
-        if clarification:
-            return {"type": "clarification", "message": clarification}
-
-        handlers = {
+        self._resolve_cache: dict[str, str | None] = {}
+        self._resolve_cache_max = 1024
+        self._resolve_version = -1
+        self._schema_cache = None
+        self._schema_version = -1
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._handlers = {
             "OWNERSHIP": self._handle_ownership,
             "DEPENDENCY_DOWNSTREAM": self._handle_downstream,
             "DEPENDENCY_UPSTREAM": self._handle_upstream,
@@ -27,7 +26,15 @@ class IntentParser:
             "TEAM_OWNS": self._handle_team_owns,
         }
 
-        handler = handlers.get(intent, self._handle_unknown)
+    def execute_intent(self, intent_data: dict) -> dict:
+        intent = intent_data.get("intent", "UNKNOWN")
+        params = intent_data.get("params", {})
+        clarification = intent_data.get("clarification")
+
+        if clarification:
+            return {"type": "clarification", "message": clarification}
+
+        handler = self._handlers.get(intent, self._handle_unknown)
         result = handler(params)
         
         if result.get("type") != "error":
@@ -38,6 +45,22 @@ class IntentParser:
         return result
 
     def _resolve_node_id(self, identifier: str) -> str | None:
+        # Entries stay valid until the graph version moves; misses are
+        # cached too, so the dict is bounded with oldest-entry eviction.
+        current_version = self.query_engine.version()
+        if current_version != self._resolve_version:
+            self._resolve_cache.clear()
+            self._resolve_version = current_version
+        if identifier in self._resolve_cache:
+            return self._resolve_cache[identifier]
+
+        resolved = self._lookup_node_id(identifier)
+        if len(self._resolve_cache) >= self._resolve_cache_max:
+            self._resolve_cache.pop(next(iter(self._resolve_cache)))
+        self._resolve_cache[identifier] = resolved
+        return resolved
+
+    def _lookup_node_id(self, identifier: str) -> str | None:
         if ":" in identifier:
             node = self.query_engine.get_node(identifier)
             if node:
@@ -177,17 +200,18 @@ class IntentParser:
         if not resolved_id:
             return {"type": "error", "message": f"Could not find '{node_id}' in the graph."}
 
-        node = self.query_engine.get_node(resolved_id)
-        owner = self.query_engine.get_owner(resolved_id)
-        downstream = self.query_engine.downstream(resolved_id)
-        upstream = self.query_engine.upstream(resolved_id)
+        # Four independent read-only lookups; run them concurrently.
+        futures = {
+            "node": self._executor.submit(self.query_engine.get_node, resolved_id),
+            "owner": self._executor.submit(self.query_engine.get_owner, resolved_id),
+            "downstream": self._executor.submit(self.query_engine.downstream, resolved_id),
+            "upstream": self._executor.submit(self.query_engine.upstream, resolved_id),
+        }
+        results = {key: future.result() for key, future in futures.items()}
 
         return {
             "type": "node_info",
-            "node": node,
-            "owner": owner,
-            "downstream": downstream,
-            "upstream": upstream,
+            **results,
         }
 
     def _handle_search(self, params: dict) -> dict:
@@ -232,17 +256,28 @@ class IntentParser:
         }
 
     def get_graph_schema(self) -> dict:
-        stats = self.query_engine.get_graph_stats()
-        
-        services = self.query_engine.get_nodes("service")
-        databases = self.query_engine.get_nodes("database")
-        caches = self.query_engine.get_nodes("cache")
-        teams = self.query_engine.get_nodes("team")
+        current_version = self.query_engine.version()
+        if self._schema_cache is not None and current_version == self._schema_version:
+            return self._schema_cache
+
+        stats_future = self._executor.submit(self.query_engine.get_graph_stats)
+        node_futures = {
+            node_type: self._executor.submit(self.query_engine.get_nodes, node_type)
+            for node_type in ("service", "database", "cache", "team")
+        }
+        stats = stats_future.result()
+        services = node_futures["service"].result()
+        databases = node_futures["database"].result()
+        caches = node_futures["cache"].result()
+        teams = node_futures["team"].result()
 
-        return {
+        schema = {
             "statistics": stats,
             "services": [s.get("name") for s in services],
             "databases": [d.get("name") for d in databases],
             "caches": [c.get("name") for c in caches],
             "teams": [t.get("name") for t in teams],
         }
+        self._schema_cache = schema
+        self._schema_version = current_version
+        return schema
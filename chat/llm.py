@@ -1,5 +1,7 @@
 import os
-import json
+import orjson
+from collections import deque
+from itertools import islice
 from google import genai
 from google.genai import types
 
@@ -9,13 +11,23 @@ class LLMClient:
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.client = genai.Client(api_key=self.api_key)
         self.model = "gemini-2.5-flash"
-        self.conversation_history = []
+        self.conversation_history: deque[dict] = deque(maxlen=10)
+        self._prompt_cache: dict[int, str] = {}
+        self._prompt_cache_max = 128
+        self._intent_cache: dict[tuple, bytes] = {}
+        self._intent_cache_max = 1024
+        self._schema_hash_cache: tuple[dict, int] | None = None
 
     def get_system_prompt(self, graph_schema: dict) -> str:
-        return f"""You are an Engineering Knowledge Graph assistant. You help users query and understand their infrastructure.
+        key = hash(orjson.dumps(graph_schema, option=orjson.OPT_SORT_KEYS))
+        cached = self._prompt_cache.get(key)
+        if cached is not None:
+            return cached
+
+        prompt = f"""You are an Engineering Knowledge Graph assistant. You help users query and understand their infrastructure.
 
 ## Available Graph Data
-{json.dumps(graph_schema, indent=2)}
+{orjson.dumps(graph_schema).decode()}
 
 ## Your Capabilities
 You can answer questions about:
@@ -52,12 +64,63 @@ Respond with a JSON object containing:
 
 If the query is ambiguous, ask for clarification."""
 
+        if len(self._prompt_cache) >= self._prompt_cache_max:
+            self._prompt_cache.pop(next(iter(self._prompt_cache)))
+        self._prompt_cache[key] = prompt
+        return prompt
+
+    def _schema_hash(self, graph_schema: dict) -> int:
+        # IntentParser hands back the same cached dict until the graph
+        # version moves, so hash the serialized schema once per object.
+        cached = self._schema_hash_cache
+        if cached is not None and cached[0] is graph_schema:
+            return cached[1]
+        value = hash(orjson.dumps(graph_schema, option=orjson.OPT_SORT_KEYS))
+        self._schema_hash_cache = (graph_schema, value)
+        return value
+
+    def schema_slim(self, graph_schema: dict, user_query: str) -> dict:
+        """Trim the schema to entries relevant to the query.
+
+        Names mentioned in the query are kept verbatim; the rest of a
+        category collapses to an omitted count. Categories with no match
+        are kept whole so list/explore queries still see every name.
+        """
+        query_lower = user_query.lower()
+        slim = {"statistics": graph_schema.get("statistics", {})}
+        for key in ("services", "databases", "caches", "teams"):
+            names = graph_schema.get(key, [])
+            relevant = [n for n in names if n and n.lower() in query_lower]
+            if relevant:
+                slim[key] = relevant
+                omitted = len(names) - len(relevant)
+                if omitted:
+                    slim[f"{key}_omitted"] = omitted
+            else:
+                slim[key] = names
+        return slim
+
     def parse_query(self, user_query: str, graph_schema: dict, context: list = None) -> dict:
-        system_prompt = self.get_system_prompt(graph_schema)
-        
+        context_tail = (
+            list(islice(context, max(0, len(context) - 4), None)) if context else []
+        )
+        cache_key = (
+            user_query.strip().lower(),
+            self._schema_hash(graph_schema),
+            tuple((ctx["role"], ctx["content"]) for ctx in context_tail),
+        )
+        # Entries are stored serialized so every hit deserializes a
+        # fresh object; callers mutating nested params can't poison the
+        # cache.
+        cached = self._intent_cache.get(cache_key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        system_prompt = self.get_system_prompt(self.schema_slim(graph_schema, user_query))
+
         messages = []
         if context:
-            for ctx in context[-4:]:
+            for ctx in context_tail:
                 role = "model" if ctx["role"] == "assistant" else ctx["role"]
                 messages.append({"role": role, "parts": [{"text": ctx["content"]}]})
         
@@ -80,14 +143,19 @@ If the query is ambiguous, ask for clarification."""
             response_text = response_text.split("```")[1].split("```")[0].strip()
         
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
             return {
                 "intent": "UNKNOWN",
                 "params": {},
                 "clarification": "I couldn't understand your query. Could you rephrase it?"
             }
 
+        if len(self._intent_cache) >= self._intent_cache_max:
+            self._intent_cache.pop(next(iter(self._intent_cache)))
+        self._intent_cache[cache_key] = orjson.dumps(parsed)
+        return parsed
+
     def format_response(self, user_query: str, query_result: dict, graph_schema: dict) -> str:
         system_prompt = """You are an Engineering Knowledge Graph assistant. Format the query results into a helpful, human-readable response.
 
@@ -97,7 +165,7 @@ Do not make up information - only use what's provided in the query result."""
         prompt = f"""User asked: {user_query}
 
 Query result data:
-{json.dumps(query_result, indent=2)}
+{orjson.dumps(query_result, default=str).decode()}
 
 Format this into a helpful response for the user."""
 
@@ -117,8 +185,6 @@ Format this into a helpful response for the user."""
             "role": "assistant" if role == "assistant" else role,
             "content": content
         })
-        if len(self.conversation_history) > 10:
-            self.conversation_history = self.conversation_history[-10:]
 
     def clear_history(self) -> None:
-        self.conversation_history = []
+        self.conversation_history.clear()
@@ -1,60 +1,85 @@
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
-@dataclass
+
+@dataclass(slots=True)
 class Node:
     id: str
     type: str
     name: str
     properties: dict[str, Any] = field(default_factory=dict)
+    _dict_cache: dict | None = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "type": self.type,
-            "name": self.name,
-            "properties": self.properties,
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "id": self.id,
+                "type": self.type,
+                "name": self.name,
+                "properties": self.properties,
+            }
+        return self._dict_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge:
     id: str
     type: str
     source: str
     target: str
     properties: dict[str, Any] = field(default_factory=dict)
+    _dict_cache: dict | None = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "type": self.type,
-            "source": self.source,
-            "target": self.target,
-            "properties": self.properties,
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "id": self.id,
+                "type": self.type,
+                "source": self.source,
+                "target": self.target,
+                "properties": self.properties,
+            }
+        return self._dict_cache
 
 
 class BaseConnector(ABC):
     def __init__(self, file_path: str):
         self.file_path = file_path
-        self.nodes: list[Node] = []
-        self.edges: list[Edge] = []
+        self._node_index: dict[str, Node] = {}
+        self._edge_index: dict[str, Edge] = {}
+
+    @property
+    def nodes(self) -> list[Node]:
+        return list(self._node_index.values())
+
+    @property
+    def edges(self) -> list[Edge]:
+        return list(self._edge_index.values())
 
     @abstractmethod
     def parse(self) -> tuple[list[Node], list[Edge]]:
         pass
 
     def _add_node(self, node: Node) -> None:
-        existing = next((n for n in self.nodes if n.id == node.id), None)
+        # Interned ids are shared across nodes, edges, and index keys, so
+        # dict lookups can short-circuit on identity.
+        node.id = sys.intern(node.id)
+        existing = self._node_index.get(node.id)
         if existing:
             existing.properties.update(node.properties)
         else:
-            self.nodes.append(node)
+            self._node_index[node.id] = node
 
     def _add_edge(self, edge: Edge) -> None:
-        existing = next((e for e in self.edges if e.id == edge.id), None)
-        if not existing:
-            self.edges.append(edge)
+        edge.id = sys.intern(edge.id)
+        edge.source = sys.intern(edge.source)
+        edge.target = sys.intern(edge.target)
+        if edge.id not in self._edge_index:
+            self._edge_index[edge.id] = edge
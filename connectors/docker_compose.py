@@ -1,24 +1,42 @@
 import re
 import yaml
-from .base import BaseConnector, Node, Edge
+from .base import BaseConnector, Node, Edge, SafeLoader
+
+# Tried in order: earlier patterns win, so a credential URL like
+# scheme://user@host:port still resolves the host, not the username.
+_URL_PATTERNS = [
+    re.compile(r"://([^:/@]+):"),
+    re.compile(r"://([^:/@]+)/"),
+    re.compile(r"@([^:/@]+):"),
+    re.compile(r"http://([^:/@]+)"),
+]
 
 
 class DockerComposeConnector(BaseConnector):
     DATABASE_IMAGES = ["postgres", "mysql", "mariadb", "mongodb", "cassandra"]
     CACHE_IMAGES = ["redis", "memcached"]
 
+    # Single-pass alternations over the substring lists above (and the
+    # name-based hints), so _infer_node_type lowercases and scans once.
+    _DB_IMAGE_RE = re.compile("|".join(DATABASE_IMAGES))
+    _CACHE_IMAGE_RE = re.compile("|".join(CACHE_IMAGES))
+    _DB_NAME_RE = re.compile(r"db|database|postgres|mysql")
+    _CACHE_NAME_RE = re.compile(r"redis|cache|memcached")
+
     def parse(self) -> tuple[list[Node], list[Edge]]:
         try:
             with open(self.file_path, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
         except Exception as e:
             print(f"Error parsing {self.file_path}: {e}")
             return [], []
 
         services = data.get("services", {})
+        type_by_name: dict[str, str] = {}
 
         for name, config in services.items():
             node_type = self._infer_node_type(name, config)
+            type_by_name[name] = node_type
             labels = config.get("labels", {})
             
             properties = {
@@ -48,20 +66,26 @@ class DockerComposeConnector(BaseConnector):
             )
             self._add_node(node)
 
+        id_by_name = {name: f"{t}:{name}" for name, t in type_by_name.items()}
+        edge_type_by_name = {
+            name: self._infer_edge_type(t) for name, t in type_by_name.items()
+        }
+
         for name, config in services.items():
-            source_type = self._infer_node_type(name, config)
-            source_id = f"{source_type}:{name}"
+            source_id = id_by_name[name]
 
             depends_on = config.get("depends_on", [])
             if isinstance(depends_on, dict):
                 depends_on = list(depends_on.keys())
-            
+
             for dep in depends_on:
-                dep_config = services.get(dep, {})
-                dep_type = self._infer_node_type(dep, dep_config)
-                target_id = f"{dep_type}:{dep}"
-                
-                edge_type = self._infer_edge_type(dep_type)
+                target_id = id_by_name.get(dep)
+                if target_id:
+                    edge_type = edge_type_by_name[dep]
+                else:
+                    dep_type = self._infer_node_type(dep, {})
+                    target_id = f"{dep_type}:{dep}"
+                    edge_type = self._infer_edge_type(dep_type)
                 edge = Edge(
                     id=f"edge:{name}-{edge_type}-{dep}",
                     type=edge_type,
@@ -77,12 +101,10 @@ class DockerComposeConnector(BaseConnector):
                 if "_URL" in key and value:
                     target_name = self._extract_service_from_url(value)
                     if target_name and target_name in services:
-                        target_config = services.get(target_name, {})
-                        target_type = self._infer_node_type(target_name, target_config)
-                        target_id = f"{target_type}:{target_name}"
-                        
+                        target_id = id_by_name[target_name]
+
                         if target_id != source_id:
-                            edge_type = self._infer_edge_type(target_type)
+                            edge_type = edge_type_by_name[target_name]
                             edge = Edge(
                                 id=f"edge:{name}-{edge_type}-{target_name}",
                                 type=edge_type,
@@ -100,17 +122,16 @@ class DockerComposeConnector(BaseConnector):
         if labels.get("type") == "cache":
             return "cache"
 
-        image = config.get("image", "")
-        for db_image in self.DATABASE_IMAGES:
-            if db_image in image.lower():
-                return "database"
-        for cache_image in self.CACHE_IMAGES:
-            if cache_image in image.lower():
-                return "cache"
+        image_lower = config.get("image", "").lower()
+        if self._DB_IMAGE_RE.search(image_lower):
+            return "database"
+        if self._CACHE_IMAGE_RE.search(image_lower):
+            return "cache"
 
-        if any(x in name.lower() for x in ["db", "database", "postgres", "mysql"]):
+        name_lower = name.lower()
+        if self._DB_NAME_RE.search(name_lower):
             return "database"
-        if any(x in name.lower() for x in ["redis", "cache", "memcached"]):
+        if self._CACHE_NAME_RE.search(name_lower):
             return "cache"
 
         return "service"
@@ -135,14 +156,8 @@ class DockerComposeConnector(BaseConnector):
         return {}
 
     def _extract_service_from_url(self, url: str) -> str | None:
-        patterns = [
-            r"://([^:/@]+):",
-            r"://([^:/@]+)/",
-            r"@([^:/@]+):",
-            r"http://([^:/@]+)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _URL_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         return None
@@ -1,27 +1,33 @@
 import re
 import yaml
-from .base import BaseConnector, Node, Edge
+from .base import BaseConnector, Node, Edge, SafeLoader
+
+_K8S_URL_RE = re.compile(r"(?:http://|://)(?P<host>[^.:/]+)[.:]?")
 
 
 class KubernetesConnector(BaseConnector):
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self._node_by_name: dict[str, Node] = {}
+
     def parse(self) -> tuple[list[Node], list[Edge]]:
         try:
+            # Stream the documents instead of materializing them all;
+            # helm-rendered manifests can run to thousands of docs.
             with open(self.file_path, "r") as f:
-                documents = list(yaml.safe_load_all(f))
+                for doc in yaml.load_all(f, Loader=SafeLoader):
+                    if not doc:
+                        continue
+
+                    kind = doc.get("kind", "")
+                    if kind == "Deployment":
+                        self._parse_deployment(doc)
+                    elif kind == "Service":
+                        self._parse_service(doc)
         except Exception as e:
             print(f"Error parsing {self.file_path}: {e}")
             return [], []
 
-        for doc in documents:
-            if not doc:
-                continue
-            
-            kind = doc.get("kind", "")
-            if kind == "Deployment":
-                self._parse_deployment(doc)
-            elif kind == "Service":
-                self._parse_service(doc)
-
         return self.nodes, self.edges
 
     def _parse_deployment(self, doc: dict) -> None:
@@ -82,6 +88,7 @@ class KubernetesConnector(BaseConnector):
             },
         )
         self._add_node(node)
+        self._node_by_name[name] = node
 
         for key, value in env_vars.items():
             if "_URL" in key and value:
@@ -111,20 +118,12 @@ class KubernetesConnector(BaseConnector):
         if ports:
             port_info = ports[0].get("port")
 
-        for node in self.nodes:
-            if node.name == name:
-                if port_info:
-                    node.properties["k8s_port"] = port_info
-                node.properties["k8s_service"] = True
-                break
+        node = self._node_by_name.get(name)
+        if node:
+            if port_info:
+                node.properties["k8s_port"] = port_info
+            node.properties["k8s_service"] = True
 
     def _extract_service_from_k8s_url(self, url: str) -> str | None:
-        patterns = [
-            r"http://([^.]+)\.",
-            r"://([^:/.]+)[.:]",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        match = _K8S_URL_RE.search(url)
+        return match.group("host") if match else None
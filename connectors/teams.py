@@ -1,12 +1,12 @@
 import yaml
-from .base import BaseConnector, Node, Edge
+from .base import BaseConnector, Node, Edge, SafeLoader
 
 
 class TeamsConnector(BaseConnector):
     def parse(self) -> tuple[list[Node], list[Edge]]:
         try:
             with open(self.file_path, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
         except Exception as e:
             print(f"Error parsing {self.file_path}: {e}")
             return [], []
@@ -43,14 +43,26 @@ class TeamsConnector(BaseConnector):
 
         return self.nodes, self.edges
 
-    def resolve_ownership_targets(self, all_nodes: list[Node]) -> list[Edge]:
+    def resolve_ownership_targets(
+        self, all_nodes: list[Node], fuzzy_substring: bool = False
+    ) -> list[Edge]:
         resolved_edges = []
         node_map = {}
-        
+
         for node in all_nodes:
             node_map[node.name] = node.id
             node_map[node.id] = node.id
 
+        # Suffix index: every token-boundary tail of a name/id maps to its
+        # node id, so endswith-style targets resolve in O(1) instead of a
+        # substring scan over every node per edge.
+        by_suffix: dict[str, str] = {}
+        for key, node_id in node_map.items():
+            by_suffix.setdefault(key, node_id)
+            for i, char in enumerate(key):
+                if char in ":-":
+                    by_suffix.setdefault(key[i + 1:], node_id)
+
         for edge in self.edges:
             if edge.type == "owns":
                 target = edge.target
@@ -64,16 +76,20 @@ class TeamsConnector(BaseConnector):
                     )
                     resolved_edges.append(resolved_edge)
                 else:
-                    for node_name, node_id in node_map.items():
-                        if target in node_name or node_name.endswith(target):
-                            resolved_edge = Edge(
-                                id=f"edge:{edge.source.split(':')[1]}-owns-{node_id.split(':')[1]}",
-                                type=edge.type,
-                                source=edge.source,
-                                target=node_id,
-                                properties=edge.properties,
-                            )
-                            resolved_edges.append(resolved_edge)
-                            break
+                    node_id = by_suffix.get(target)
+                    if not node_id and fuzzy_substring:
+                        node_id = next(
+                            (nid for name, nid in node_map.items() if target in name),
+                            None,
+                        )
+                    if node_id:
+                        resolved_edge = Edge(
+                            id=f"edge:{edge.source.split(':')[1]}-owns-{node_id.split(':')[1]}",
+                            type=edge.type,
+                            source=edge.source,
+                            target=node_id,
+                            properties=edge.properties,
+                        )
+                        resolved_edges.append(resolved_edge)
 
         return resolved_edges
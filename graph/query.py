@@ -1,3 +1,5 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from .storage import GraphStorage
 
@@ -11,149 +13,322 @@ class BlastRadiusResult:
     total_affected: int
 
 
+class PathfindingFacade:
+    """Bidirectional BFS over cheap one-hop Cypher expansions.
+
+    Variable-length shortestPath expansion costs O(b^d) node visits;
+    alternating frontiers that meet in the middle cost O(b^(d/2)).
+    Traversal is undirected to match the shortestPath query it replaces,
+    and the smaller frontier is expanded each round.
+    """
+
+    MAX_DEPTH = 15
+
+    def __init__(self, storage: GraphStorage):
+        self.storage = storage
+
+    def _neighbors(self, frontier: set[str]) -> dict[str, list[str]]:
+        query = """
+        MATCH (n:Entity)-[:EDGE]-(m:Entity)
+        WHERE n.id IN $frontier
+        RETURN n.id AS source, collect(DISTINCT m.id) AS neighbors
+        """
+        records = self.storage.execute(query, frontier=list(frontier))
+        return {record["source"]: record["neighbors"] for record in records}
+
+    def shortest_path_ids(self, from_id: str, to_id: str) -> list[str] | None:
+        if from_id == to_id:
+            return [from_id]
+
+        parents_fwd: dict[str, str | None] = {from_id: None}
+        parents_bwd: dict[str, str | None] = {to_id: None}
+        frontier_fwd = {from_id}
+        frontier_bwd = {to_id}
+
+        for _ in range(self.MAX_DEPTH):
+            if not frontier_fwd or not frontier_bwd:
+                return None
+
+            forward = len(frontier_fwd) <= len(frontier_bwd)
+            frontier = frontier_fwd if forward else frontier_bwd
+            parents = parents_fwd if forward else parents_bwd
+            others = parents_bwd if forward else parents_fwd
+
+            next_frontier = set()
+            for node, adjacent in self._neighbors(frontier).items():
+                for neighbor in adjacent:
+                    if neighbor not in parents:
+                        parents[neighbor] = node
+                        next_frontier.add(neighbor)
+
+            meeting = next_frontier & others.keys()
+            if meeting:
+                return self._reconstruct(
+                    next(iter(meeting)), parents_fwd, parents_bwd
+                )
+
+            if forward:
+                frontier_fwd = next_frontier
+            else:
+                frontier_bwd = next_frontier
+
+        return None
+
+    def _reconstruct(
+        self,
+        meeting: str,
+        parents_fwd: dict[str, str | None],
+        parents_bwd: dict[str, str | None],
+    ) -> list[str]:
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = parents_fwd[node]
+        path.reverse()
+
+        node = parents_bwd[meeting]
+        while node is not None:
+            path.append(node)
+            node = parents_bwd[node]
+        return path
+
+
 class QueryEngine:
+    RESULT_CACHE_MAX = 1024
+
+    _DOWNSTREAM_ALL = """
+        MATCH (start:Entity {id: $node_id})-[:EDGE*1..10]->(downstream:Entity)
+        RETURN DISTINCT properties(downstream) AS downstream
+        """
+    _DOWNSTREAM_TYPED = """
+        MATCH path = (start:Entity {id: $node_id})-[:EDGE*1..10]->(downstream:Entity)
+        WHERE ALL(rel IN relationships(path) WHERE rel.type IN $edge_types)
+        RETURN DISTINCT properties(downstream) AS downstream
+        """
+    _UPSTREAM_ALL = """
+        MATCH (upstream:Entity)-[:EDGE*1..10]->(target:Entity {id: $node_id})
+        RETURN DISTINCT properties(upstream) AS upstream
+        """
+    _UPSTREAM_TYPED = """
+        MATCH path = (upstream:Entity)-[:EDGE*1..10]->(target:Entity {id: $node_id})
+        WHERE ALL(rel IN relationships(path) WHERE rel.type IN $edge_types)
+        RETURN DISTINCT properties(upstream) AS upstream
+        """
+
     def __init__(self, storage: GraphStorage):
         self.storage = storage
+        self._pathfinder = PathfindingFacade(storage)
+        self._result_cache: dict[tuple, object] = {}
+        self._cache_version = -1
+        self._executor = ThreadPoolExecutor(max_workers=3)
+
+    def version(self) -> int:
+        return self.storage.version
+
+    def _cached(self, key: tuple, compute):
+        # Results stay valid until the storage version moves, at which
+        # point the whole cache is dropped.
+        current = self.storage.version
+        if current != self._cache_version:
+            self._result_cache.clear()
+            self._cache_version = current
+        if key in self._result_cache:
+            return self._result_cache[key]
+        value = compute()
+        if len(self._result_cache) >= self.RESULT_CACHE_MAX:
+            self._result_cache.pop(next(iter(self._result_cache)))
+        self._result_cache[key] = value
+        return value
 
     def get_node(self, node_id: str) -> dict | None:
-        return self.storage.get_node(node_id)
+        return self._cached(
+            ("get_node", node_id), lambda: self.storage.get_node(node_id)
+        )
 
     def get_nodes(self, node_type: str = None, filters: dict = None) -> list[dict]:
-        return self.storage.get_nodes(node_type, filters)
+        try:
+            filter_key = tuple(sorted(filters.items())) if filters else None
+            hash(filter_key)
+        except TypeError:
+            # Unhashable filter values (e.g. lists) can't key the cache;
+            # serve them uncached rather than refusing them.
+            return self.storage.get_nodes(node_type, filters)
+        return self._cached(
+            ("get_nodes", node_type, filter_key),
+            lambda: self.storage.get_nodes(node_type, filters),
+        )
 
     def downstream(self, node_id: str, edge_types: list[str] = None) -> list[dict]:
+        return self._cached(
+            ("downstream", node_id, tuple(edge_types) if edge_types else None),
+            lambda: self._traverse_downstream(node_id, edge_types),
+        )
+
+    def _traverse_downstream(self, node_id: str, edge_types: list[str] = None) -> list[dict]:
         if edge_types:
-            type_filter = " AND r.type IN $edge_types"
+            query = self._DOWNSTREAM_TYPED
+            params = {"node_id": node_id, "edge_types": edge_types}
         else:
-            type_filter = ""
-
-        query = f"""
-        MATCH (start {{id: $node_id}})
-        MATCH path = (start)-[r:EDGE*1..10]->(downstream)
-        WHERE ALL(rel IN relationships(path) WHERE true{type_filter})
-        WITH DISTINCT downstream
-        RETURN downstream
-        """
-        
-        with self.storage._driver.session() as session:
+            query = self._DOWNSTREAM_ALL
             params = {"node_id": node_id}
-            if edge_types:
-                params["edge_types"] = edge_types
-            result = session.run(query, **params)
-            return [dict(record["downstream"]) for record in result]
+
+        records = self.storage.execute(query, **params)
+        return [record["downstream"] for record in records]
 
     def upstream(self, node_id: str, edge_types: list[str] = None) -> list[dict]:
+        return self._cached(
+            ("upstream", node_id, tuple(edge_types) if edge_types else None),
+            lambda: self._traverse_upstream(node_id, edge_types),
+        )
+
+    def _traverse_upstream(self, node_id: str, edge_types: list[str] = None) -> list[dict]:
         if edge_types:
-            type_filter = " AND r.type IN $edge_types"
+            query = self._UPSTREAM_TYPED
+            params = {"node_id": node_id, "edge_types": edge_types}
         else:
-            type_filter = ""
-
-        query = f"""
-        MATCH (target {{id: $node_id}})
-        MATCH path = (upstream)-[r:EDGE*1..10]->(target)
-        WHERE ALL(rel IN relationships(path) WHERE true{type_filter})
-        WITH DISTINCT upstream
-        RETURN upstream
-        """
-        
-        with self.storage._driver.session() as session:
+            query = self._UPSTREAM_ALL
             params = {"node_id": node_id}
-            if edge_types:
-                params["edge_types"] = edge_types
-            result = session.run(query, **params)
-            return [dict(record["upstream"]) for record in result]
 
-    def blast_radius(self, node_id: str) -> BlastRadiusResult:
-        node = self.get_node(node_id)
-        if not node:
-            return None
+        records = self.storage.execute(query, **params)
+        return [record["upstream"] for record in records]
 
-        upstream = self.upstream(node_id)
-        downstream = self.downstream(node_id)
+    def blast_radius(self, node_id: str) -> BlastRadiusResult:
+        return self._cached(
+            ("blast_radius", node_id), lambda: self._compute_blast_radius(node_id)
+        )
 
-        all_affected_ids = set()
-        for n in upstream + downstream:
-            all_affected_ids.add(n.get("id"))
-        all_affected_ids.add(node_id)
+    def _compute_blast_radius(self, node_id: str) -> BlastRadiusResult:
+        # Both traversal directions, the owning teams, and the affected
+        # count come back in one round-trip instead of 3 + N owner
+        # lookups.
+        query = """
+        MATCH (n:Entity {id: $node_id})
+        OPTIONAL MATCH (n)-[:EDGE*1..10]->(d)
+        WITH n, collect(DISTINCT d) AS down
+        OPTIONAL MATCH (u)-[:EDGE*1..10]->(n)
+        WITH n, down, collect(DISTINCT u) AS up
+        UNWIND (down + up + [n]) AS affected
+        OPTIONAL MATCH (team:Entity {type: 'team'})-[:EDGE {type: 'owns'}]->(affected)
+        RETURN properties(n) AS n,
+               [x IN down | properties(x)] AS down,
+               [x IN up | properties(x)] AS up,
+               [t IN collect(DISTINCT team) | properties(t)] AS teams,
+               count(DISTINCT affected) AS total_affected
+        """
 
-        affected_teams = []
-        for affected_id in all_affected_ids:
-            team = self.get_owner(affected_id)
-            if team and team not in affected_teams:
-                affected_teams.append(team)
+        records = self.storage.execute(query, node_id=node_id)
+        if not records:
+            return None
+        record = records[0]
 
         return BlastRadiusResult(
-            node=node,
-            upstream=upstream,
-            downstream=downstream,
-            affected_teams=affected_teams,
-            total_affected=len(all_affected_ids),
+            node=record["n"],
+            upstream=record["up"],
+            downstream=record["down"],
+            affected_teams=record["teams"],
+            total_affected=record["total_affected"],
         )
 
     def path(self, from_id: str, to_id: str) -> list[dict]:
+        path_ids = self._pathfinder.shortest_path_ids(from_id, to_id)
+        if not path_ids:
+            return []
+
         query = """
-        MATCH (start {id: $from_id}), (end {id: $to_id})
-        MATCH path = shortestPath((start)-[*..15]-(end))
-        UNWIND nodes(path) as node
-        RETURN DISTINCT node
+        MATCH (n:Entity)
+        WHERE n.id IN $ids
+        RETURN properties(n) AS n
         """
-        
-        with self.storage._driver.session() as session:
-            result = session.run(query, from_id=from_id, to_id=to_id)
-            return [dict(record["node"]) for record in result]
+        records = self.storage.execute(query, ids=path_ids)
+        by_id = {record["n"]["id"]: record["n"] for record in records}
+        return [by_id[node_id] for node_id in path_ids if node_id in by_id]
 
     def get_owner(self, node_id: str) -> dict | None:
+        return self.get_owners([node_id]).get(node_id)
+
+    def get_owners(self, node_ids: list[str]) -> dict[str, dict]:
+        return self._cached(
+            ("get_owners", tuple(sorted(node_ids))),
+            lambda: self._fetch_owners(list(node_ids)),
+        )
+
+    def _fetch_owners(self, node_ids: list[str]) -> dict[str, dict]:
+        # One UNWIND round-trip for the whole id batch instead of a
+        # query per node.
         query = """
-        MATCH (team {type: 'team'})-[r:EDGE {type: 'owns'}]->(target {id: $node_id})
-        RETURN team
+        UNWIND $ids AS affected_id
+        MATCH (team:Entity {type: 'team'})-[r:EDGE {type: 'owns'}]->(target:Entity {id: affected_id})
+        RETURN affected_id AS id, properties(team) AS team
         """
-        
-        with self.storage._driver.session() as session:
-            result = session.run(query, node_id=node_id)
-            record = result.single()
-            if record:
-                return dict(record["team"])
-            return None
+
+        records = self.storage.execute(query, ids=node_ids)
+        return {record["id"]: record["team"] for record in records}
 
     def get_nodes_owned_by_team(self, team_name: str) -> list[dict]:
         team_id = f"team:{team_name}"
-        
+
         query = """
-        MATCH (team {id: $team_id})-[r:EDGE {type: 'owns'}]->(owned)
-        RETURN owned
+        MATCH (team:Entity {id: $team_id})-[r:EDGE {type: 'owns'}]->(owned:Entity)
+        RETURN properties(owned) AS owned
         """
-        
-        with self.storage._driver.session() as session:
-            result = session.run(query, team_id=team_id)
-            return [dict(record["owned"]) for record in result]
+
+        records = self.storage.execute(query, team_id=team_id)
+        return [record["owned"] for record in records]
 
     def get_services_using_node(self, node_id: str) -> list[dict]:
         return self.upstream(node_id)
 
+    # Lucene operator characters are stripped from user input before it
+    # reaches the full-text parser.
+    _LUCENE_SPECIALS = re.compile(r'[+\-&|!(){}\[\]^"~*?:\\/]')
+
     def search_nodes(self, query_text: str) -> list[dict]:
+        # The node_text full-text index answers this from its inverted
+        # index instead of a CONTAINS scan over every node; each term is
+        # matched as a prefix so partial names still hit.
+        terms = self._LUCENE_SPECIALS.sub(" ", query_text).split()
+        if not terms:
+            return []
+
         query = """
-        MATCH (n)
-        WHERE toLower(n.name) CONTAINS toLower($query_text)
-           OR toLower(n.id) CONTAINS toLower($query_text)
-        RETURN n
+        CALL db.index.fulltext.queryNodes('node_text', $query_text)
+        YIELD node
+        RETURN properties(node) AS n
+        LIMIT 100
         """
-        
-        with self.storage._driver.session() as session:
-            result = session.run(query, query_text=query_text)
-            return [dict(record["n"]) for record in result]
+
+        lucene_query = " ".join(f"{term}*" for term in terms)
+        records = self.storage.execute(query, query_text=lucene_query)
+        return [record["n"] for record in records]
 
     def get_graph_stats(self) -> dict:
-        query_nodes = "MATCH (n) RETURN count(n) as count"
-        query_edges = "MATCH ()-[r]->() RETURN count(r) as count"
-        query_types = "MATCH (n) RETURN DISTINCT n.type as type, count(n) as count"
-        
-        with self.storage._driver.session() as session:
-            node_count = session.run(query_nodes).single()["count"]
-            edge_count = session.run(query_edges).single()["count"]
-            types = {r["type"]: r["count"] for r in session.run(query_types)}
-            
-            return {
-                "total_nodes": node_count,
-                "total_edges": edge_count,
-                "nodes_by_type": types,
-            }
+        return self._cached(("get_graph_stats",), self._compute_graph_stats)
+
+    def _compute_graph_stats(self) -> dict:
+        query_types = "MATCH (n:Entity) RETURN DISTINCT n.type as type, count(n) as count"
+        types_future = self._executor.submit(self.storage.execute, query_types)
+
+        if self.storage.has_apoc():
+            # Totals come from store metadata instead of scans.
+            meta = self.storage.execute(
+                "CALL apoc.meta.stats() YIELD labels, relCount RETURN labels, relCount"
+            )[0]
+            node_count = meta["labels"].get("Entity", 0)
+            edge_count = meta["relCount"]
+        else:
+            # Labeled counts are satisfied by the count store, no scan.
+            query_nodes = "MATCH (n:Entity) RETURN count(n) as count"
+            query_edges = "MATCH ()-[r:EDGE]->() RETURN count(r) as count"
+            nodes_future = self._executor.submit(self.storage.execute, query_nodes)
+            edges_future = self._executor.submit(self.storage.execute, query_edges)
+            node_count = nodes_future.result()[0]["count"]
+            edge_count = edges_future.result()[0]["count"]
+
+        types = {r["type"]: r["count"] for r in types_future.result()}
+
+        return {
+            "total_nodes": node_count,
+            "total_edges": edge_count,
+            "nodes_by_type": types,
+        }
@@ -1,26 +1,47 @@
 import os
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, RoutingControl
 from connectors.base import Node, Edge
 
 
 class GraphStorage:
+    INDEX_STATEMENTS = [
+        "CREATE INDEX node_id IF NOT EXISTS FOR (n:Entity) ON (n.id)",
+        "CREATE INDEX node_type IF NOT EXISTS FOR (n:Entity) ON (n.type)",
+        "CREATE INDEX node_name IF NOT EXISTS FOR (n:Entity) ON (n.name)",
+        "CREATE FULLTEXT INDEX node_text IF NOT EXISTS FOR (n:Entity) ON EACH [n.name, n.id]",
+    ]
+
     def __init__(
         self,
         uri: str = None,
         user: str = None,
         password: str = None,
+        database: str = None,
     ):
         self.uri = uri or os.getenv("NEO4J_URI", "bolt://localhost:7687")
         self.user = user or os.getenv("NEO4J_USER", "neo4j")
         self.password = password or os.getenv("NEO4J_PASSWORD", "password")
+        self.database = database or os.getenv("NEO4J_DATABASE", "neo4j")
         self._driver = None
+        self._has_apoc = None
+        self.version = 0
 
     def connect(self) -> None:
         if not self._driver:
+            # Explicit pool bounds keep the latency tail predictable
+            # under concurrent FastAPI requests.
             self._driver = GraphDatabase.driver(
                 self.uri,
                 auth=(self.user, self.password),
+                max_connection_pool_size=int(os.getenv("NEO4J_POOL_SIZE", "32")),
+                connection_acquisition_timeout=10,
+                connection_timeout=5,
+                max_connection_lifetime=3600,
+                keep_alive=True,
             )
+            self._driver.verify_connectivity()
+            for statement in self.INDEX_STATEMENTS:
+                self.execute(statement, routing=RoutingControl.WRITE)
 
     def close(self) -> None:
         if self._driver:
@@ -34,114 +55,243 @@ class GraphStorage:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    def execute(
+        self,
+        query: str,
+        routing: RoutingControl = RoutingControl.READ,
+        **params,
+    ) -> list:
+        # execute_query reuses pooled connections instead of paying the
+        # session acquire/release cost per call; the explicit database
+        # skips home-database resolution, and the routing hint lets
+        # clustered deployments serve reads from followers.
+        result = self._driver.execute_query(
+            query,
+            params,
+            database_=self.database,
+            routing_=routing,
+        )
+        return result.records
+
     def clear_all(self) -> None:
-        with self._driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        self.execute("MATCH (n) DETACH DELETE n", routing=RoutingControl.WRITE)
+        self.version += 1
 
     def upsert_node(self, node: Node) -> None:
         query = """
-        MERGE (n {id: $id})
+        MERGE (n:Entity {id: $id})
         SET n.type = $type,
             n.name = $name,
             n += $properties
         """
-        with self._driver.session() as session:
-            session.run(
-                query,
-                id=node.id,
-                type=node.type,
-                name=node.name,
-                properties=node.properties,
-            )
+        self.execute(
+            query,
+            routing=RoutingControl.WRITE,
+            id=node.id,
+            type=node.type,
+            name=node.name,
+            properties=node.properties,
+        )
+        self.version += 1
 
     def upsert_edge(self, edge: Edge) -> None:
         query = """
-        MATCH (source {id: $source})
-        MATCH (target {id: $target})
+        MATCH (source:Entity {id: $source})
+        MATCH (target:Entity {id: $target})
         MERGE (source)-[r:EDGE {id: $id}]->(target)
         SET r.type = $type,
             r += $properties
         """
-        with self._driver.session() as session:
-            session.run(
-                query,
-                id=edge.id,
-                type=edge.type,
-                source=edge.source,
-                target=edge.target,
-                properties=edge.properties,
-            )
+        self.execute(
+            query,
+            routing=RoutingControl.WRITE,
+            id=edge.id,
+            type=edge.type,
+            source=edge.source,
+            target=edge.target,
+            properties=edge.properties,
+        )
+        self.version += 1
 
     def get_node(self, node_id: str) -> dict | None:
         query = """
-        MATCH (n {id: $id})
-        RETURN n
+        MATCH (n:Entity {id: $id})
+        RETURN properties(n) AS n
         """
-        with self._driver.session() as session:
-            result = session.run(query, id=node_id)
-            record = result.single()
-            if record:
-                return dict(record["n"])
-            return None
+        records = self.execute(query, id=node_id)
+        if records:
+            return records[0]["n"]
+        return None
+
+    # Static query texts: the server's plan cache is keyed on the
+    # literal query string, so per-call assembly would force replans.
+    _FILTER_CLAUSE = " WHERE all(key IN keys($filters) WHERE n[key] = $filters[key])"
+    GET_NODES_QUERIES = {
+        (False, False): "MATCH (n:Entity) RETURN properties(n) AS n",
+        (True, False): "MATCH (n:Entity {type: $type}) RETURN properties(n) AS n",
+        (False, True): "MATCH (n:Entity)" + _FILTER_CLAUSE + " RETURN properties(n) AS n",
+        (True, True): "MATCH (n:Entity {type: $type})" + _FILTER_CLAUSE + " RETURN properties(n) AS n",
+    }
 
     def get_nodes(self, node_type: str = None, filters: dict = None) -> list[dict]:
+        query = self.GET_NODES_QUERIES[(bool(node_type), bool(filters))]
+        params = {}
+        if node_type:
+            params["type"] = node_type
+        if filters:
+            params["filters"] = filters
+
+        records = self.execute(query, **params)
+        return [record["n"] for record in records]
+
+    def stream_nodes(self, node_type: str = None):
+        # Generator variant of get_nodes: yields while the bolt
+        # connection keeps paging instead of materializing every record.
         if node_type:
-            query = "MATCH (n {type: $type})"
+            query = "MATCH (n:Entity {type: $type}) RETURN properties(n) AS n"
             params = {"type": node_type}
         else:
-            query = "MATCH (n)"
+            query = "MATCH (n:Entity) RETURN properties(n) AS n"
             params = {}
 
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                param_name = f"filter_{key}"
-                conditions.append(f"n.{key} = ${param_name}")
-                params[param_name] = value
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-
-        query += " RETURN n"
-
-        with self._driver.session() as session:
+        with self._driver.session(database=self.database) as session:
             result = session.run(query, **params)
-            return [dict(record["n"]) for record in result]
+            for record in result:
+                yield record["n"]
 
     def delete_node(self, node_id: str) -> bool:
         query = """
-        MATCH (n {id: $id})
+        MATCH (n:Entity {id: $id})
         DETACH DELETE n
         RETURN count(n) as deleted
         """
-        with self._driver.session() as session:
-            result = session.run(query, id=node_id)
-            record = result.single()
-            return record["deleted"] > 0 if record else False
+        records = self.execute(query, routing=RoutingControl.WRITE, id=node_id)
+        self.version += 1
+        return records[0]["deleted"] > 0 if records else False
 
-    def get_all_edges(self) -> list[dict]:
-        query = """
-        MATCH (source)-[r:EDGE]->(target)
-        RETURN r.id as id, r.type as type, source.id as source, target.id as target, r as properties
-        """
-        with self._driver.session() as session:
+    def stream_edges(self):
+        # With APOC the id/type bookkeeping keys are stripped
+        # server-side, so each record arrives as plain maps needing no
+        # Python-side rewalk.
+        if self.has_apoc():
+            query = """
+            MATCH (source:Entity)-[r:EDGE]->(target:Entity)
+            RETURN r.id as id, r.type as type, source.id as source, target.id as target,
+                   apoc.map.removeKeys(properties(r), ['id', 'type']) AS properties
+            """
+            strip_keys = False
+        else:
+            query = """
+            MATCH (source:Entity)-[r:EDGE]->(target:Entity)
+            RETURN r.id as id, r.type as type, source.id as source, target.id as target,
+                   properties(r) AS properties
+            """
+            strip_keys = True
+
+        with self._driver.session(database=self.database) as session:
             result = session.run(query)
-            edges = []
             for record in result:
-                edge_dict = {
+                properties = record["properties"]
+                if strip_keys:
+                    properties = {k: v for k, v in properties.items()
+                                  if k not in ["id", "type"]}
+                yield {
                     "id": record["id"],
                     "type": record["type"],
                     "source": record["source"],
                     "target": record["target"],
-                    "properties": {k: v for k, v in dict(record["properties"]).items() 
-                                   if k not in ["id", "type"]},
+                    "properties": properties,
                 }
-                edges.append(edge_dict)
-            return edges
+
+    def get_all_edges(self) -> list[dict]:
+        return list(self.stream_edges())
+
+    # Batches are capped so a single transaction never holds an
+    # unbounded row list in memory.
+    BULK_BATCH_SIZE = 10_000
+
+    _NODE_ROW_CYPHER = """
+        MERGE (n:Entity {id: row.id})
+        SET n.type = row.type,
+            n.name = row.name,
+            n += row.properties
+        """
+    _EDGE_ROW_CYPHER = """
+        MATCH (source:Entity {id: row.source})
+        MATCH (target:Entity {id: row.target})
+        MERGE (source)-[r:EDGE {id: row.id}]->(target)
+        SET r.type = row.type,
+            r += row.properties
+        """
+
+    def has_apoc(self) -> bool:
+        if self._has_apoc is None:
+            records = self.execute(
+                "SHOW PROCEDURES YIELD name WHERE name = 'apoc.periodic.iterate' RETURN name"
+            )
+            self._has_apoc = bool(records)
+        return self._has_apoc
+
+    def _bulk_upsert(self, row_cypher: str, rows: list[dict]) -> None:
+        if self.has_apoc():
+            # apoc.periodic.iterate commits server-side batches, so the
+            # whole import is one client round-trip.
+            self.execute(
+                """
+                CALL apoc.periodic.iterate(
+                  'UNWIND $rows AS row RETURN row',
+                  $rowCypher,
+                  {batchSize: $batchSize, parallel: false, params: {rows: $rows}})
+                """,
+                routing=RoutingControl.WRITE,
+                rows=rows,
+                rowCypher=row_cypher,
+                batchSize=self.BULK_BATCH_SIZE,
+            )
+        else:
+            query = "UNWIND $rows AS row " + row_cypher
+            for start in range(0, len(rows), self.BULK_BATCH_SIZE):
+                self.execute(
+                    query,
+                    routing=RoutingControl.WRITE,
+                    rows=rows[start:start + self.BULK_BATCH_SIZE],
+                )
+        self.version += 1
 
     def bulk_upsert_nodes(self, nodes: list[Node]) -> None:
-        for node in nodes:
-            self.upsert_node(node)
+        rows = [
+            {
+                "id": node.id,
+                "type": node.type,
+                "name": node.name,
+                "properties": node.properties,
+            }
+            for node in nodes
+        ]
+        self._bulk_upsert(self._NODE_ROW_CYPHER, rows)
 
     def bulk_upsert_edges(self, edges: list[Edge]) -> None:
-        for edge in edges:
-            self.upsert_edge(edge)
+        rows = [
+            {
+                "id": edge.id,
+                "type": edge.type,
+                "source": edge.source,
+                "target": edge.target,
+                "properties": edge.properties,
+            }
+            for edge in edges
+        ]
+        self._bulk_upsert(self._EDGE_ROW_CYPHER, rows)
+
+    def get_ingest_hash(self) -> str | None:
+        records = self.execute(
+            "MATCH (m:Meta {id: 'ingest'}) RETURN m.input_hash AS input_hash"
+        )
+        return records[0]["input_hash"] if records else None
+
+    def set_ingest_hash(self, input_hash: str) -> None:
+        self.execute(
+            "MERGE (m:Meta {id: 'ingest'}) SET m.input_hash = $input_hash",
+            routing=RoutingControl.WRITE,
+            input_hash=input_hash,
+        )
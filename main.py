@@ -1,8 +1,11 @@
+import hashlib
 import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -14,54 +17,68 @@ from chat.intent import IntentParser
 
 load_dotenv()
 
-storage = None
-query_engine = None
-llm_client = None
-intent_parser = None
 
+def _input_hash(paths: list[str]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
 
-def load_graph():
-    global storage, query_engine, llm_client, intent_parser
-    
+
+def load_graph() -> GraphStorage:
     storage = GraphStorage()
     storage.connect()
-    
-    storage.clear_all()
-    
-    docker_connector = DockerComposeConnector("data/docker-compose.yml")
-    docker_nodes, docker_edges = docker_connector.parse()
-    storage.bulk_upsert_nodes(docker_nodes)
-    storage.bulk_upsert_edges(docker_edges)
-    print(f"Loaded {len(docker_nodes)} nodes and {len(docker_edges)} edges from docker-compose.yml")
-    
-    teams_connector = TeamsConnector("data/teams.yaml")
-    teams_nodes, teams_edges = teams_connector.parse()
-    storage.bulk_upsert_nodes(teams_nodes)
-    storage.bulk_upsert_edges(teams_edges)
-    print(f"Loaded {len(teams_nodes)} nodes and {len(teams_edges)} edges from teams.yaml")
-    
+
+    connectors = [
+        DockerComposeConnector("data/docker-compose.yml"),
+        TeamsConnector("data/teams.yaml"),
+    ]
     if os.path.exists("data/k8s-deployments.yaml"):
-        k8s_connector = KubernetesConnector("data/k8s-deployments.yaml")
-        k8s_nodes, k8s_edges = k8s_connector.parse()
-        storage.bulk_upsert_nodes(k8s_nodes)
-        storage.bulk_upsert_edges(k8s_edges)
-        print(f"Loaded {len(k8s_nodes)} nodes and {len(k8s_edges)} edges from k8s-deployments.yaml")
-    
-    query_engine = QueryEngine(storage)
-    llm_client = LLMClient()
-    intent_parser = IntentParser(query_engine)
-    
-    stats = query_engine.get_graph_stats()
-    print(f"Graph loaded: {stats['total_nodes']} nodes, {stats['total_edges']} edges")
-    print(f"Node types: {stats['nodes_by_type']}")
+        connectors.append(KubernetesConnector("data/k8s-deployments.yaml"))
+
+    # Skip the whole reload when the source files are byte-identical to
+    # what's already in the graph.
+    input_hash = _input_hash([connector.file_path for connector in connectors])
+    if storage.get_ingest_hash() == input_hash:
+        print("Graph already matches source files, skipping reload")
+    else:
+        storage.clear_all()
+
+        # Each connector is independent and spends its time in file I/O
+        # and libyaml parsing, so parse them concurrently and upsert in
+        # order.
+        with ThreadPoolExecutor(max_workers=len(connectors)) as executor:
+            futures = [executor.submit(connector.parse) for connector in connectors]
+            results = [future.result() for future in futures]
+
+        for connector, (nodes, edges) in zip(connectors, results):
+            storage.bulk_upsert_nodes(nodes)
+            storage.bulk_upsert_edges(edges)
+            print(f"Loaded {len(nodes)} nodes and {len(edges)} edges from {connector.file_path}")
+
+        storage.set_ingest_hash(input_hash)
+
+    return storage
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    load_graph()
+    # One driver/engine/client per process, shared across requests via
+    # app.state instead of module globals.
+    storage = load_graph()
+    app.state.storage = storage
+    app.state.query_engine = QueryEngine(storage)
+    app.state.llm_client = LLMClient()
+    app.state.intent_parser = IntentParser(app.state.query_engine)
+
+    stats = app.state.query_engine.get_graph_stats()
+    print(f"Graph loaded: {stats['total_nodes']} nodes, {stats['total_edges']} edges")
+    print(f"Node types: {stats['nodes_by_type']}")
+
     yield
-    if storage:
-        storage.close()
+    storage.close()
 
 
 app = FastAPI(
@@ -84,6 +101,22 @@ class ChatResponse(BaseModel):
     raw_result: dict = None
 
 
+def get_storage(request: Request) -> GraphStorage:
+    return request.app.state.storage
+
+
+def get_query_engine(request: Request) -> QueryEngine:
+    return request.app.state.query_engine
+
+
+def get_llm_client(request: Request) -> LLMClient:
+    return request.app.state.llm_client
+
+
+def get_intent_parser(request: Request) -> IntentParser:
+    return request.app.state.intent_parser
+
+
 @app.get("/")
 async def root():
     return FileResponse("static/index.html")
@@ -95,7 +128,7 @@ async def health():
 
 
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(query_engine: QueryEngine = Depends(get_query_engine)):
     try:
         stats = query_engine.get_graph_stats()
         return stats
@@ -104,7 +137,7 @@ async def get_stats():
 
 
 @app.get("/api/nodes")
-async def get_nodes(type: str = None):
+async def get_nodes(type: str = None, query_engine: QueryEngine = Depends(get_query_engine)):
     try:
         nodes = query_engine.get_nodes(node_type=type)
         return {"nodes": nodes}
@@ -113,7 +146,7 @@ async def get_nodes(type: str = None):
 
 
 @app.get("/api/nodes/{node_id}")
-async def get_node(node_id: str):
+async def get_node(node_id: str, query_engine: QueryEngine = Depends(get_query_engine)):
     try:
         node = query_engine.get_node(node_id)
         if not node:
@@ -126,17 +159,33 @@ async def get_node(node_id: str):
 
 
 @app.get("/api/graph")
-async def get_graph():
-    try:
-        nodes = query_engine.get_nodes()
-        edges = storage.get_all_edges()
-        return {"nodes": nodes, "edges": edges}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_graph(storage: GraphStorage = Depends(get_storage)):
+    def generate():
+        # Stream nodes and edges straight off the bolt cursors so the
+        # full graph is never materialized in memory. The status line is
+        # sent before the generator runs, so a query failure mid-stream
+        # truncates the body rather than producing a 500.
+        yield b'{"nodes":['
+        for i, node in enumerate(storage.stream_nodes()):
+            if i:
+                yield b","
+            yield orjson.dumps(node)
+        yield b'],"edges":['
+        for i, edge in enumerate(storage.stream_edges()):
+            if i:
+                yield b","
+            yield orjson.dumps(edge)
+        yield b']}'
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    llm_client: LLMClient = Depends(get_llm_client),
+    intent_parser: IntentParser = Depends(get_intent_parser),
+):
     try:
         schema = intent_parser.get_graph_schema()
         
@@ -175,7 +224,7 @@ async def chat(request: ChatRequest):
 
 
 @app.post("/api/chat/clear")
-async def clear_chat():
+async def clear_chat(llm_client: LLMClient = Depends(get_llm_client)):
     llm_client.clear_history()
     return {"status": "cleared"}
 
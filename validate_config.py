@@ -3,6 +3,13 @@ import sys
 import re
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+_SERVICE_URL_RE = re.compile(r'http://([a-zA-Z0-9_-]+):\d+')
+
 
 class ConfigValidator:
     def __init__(self):
@@ -39,7 +46,7 @@ class ConfigValidator:
     def validate_docker_compose(self, path: Path) -> None:
         try:
             with open(path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
         except yaml.YAMLError as e:
             self.errors.append(f"Invalid YAML in {path}: {e}")
             return
@@ -93,8 +100,7 @@ class ConfigValidator:
                         self._validate_service_url(name, key, str(value), services)
 
     def _validate_service_url(self, service: str, key: str, value: str, services: dict) -> None:
-        url_pattern = r'http://([a-zA-Z0-9_-]+):\d+'
-        matches = re.findall(url_pattern, value)
+        matches = _SERVICE_URL_RE.findall(value)
         for match in matches:
             if match not in services:
                 self.warnings.append(
@@ -104,7 +110,7 @@ class ConfigValidator:
     def validate_teams(self, path: Path) -> None:
         try:
             with open(path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
         except yaml.YAMLError as e:
             self.errors.append(f"Invalid YAML in {path}: {e}")
             return
@@ -139,7 +145,7 @@ class ConfigValidator:
     def validate_kubernetes(self, path: Path) -> None:
         try:
             with open(path, 'r') as f:
-                docs = list(yaml.safe_load_all(f))
+                docs = list(yaml.load_all(f, Loader=SafeLoader))
         except yaml.YAMLError as e:
             self.errors.append(f"Invalid YAML in {path}: {e}")
             return